@@ -1,21 +1,35 @@
+from __future__ import annotations
+
 import os
 
 from google.cloud import storage
 
+# Resumable uploads are sent in chunks, whose size must be a multiple of 256 KiB
+UPLOAD_CHUNK_SIZE = 32 * 256 * 1024
+
 
 class ExportToGoogleCloudStorage:
     """This class provides the upload of files into the Google Cloud Storage"""
-    def __init__(self, project_name: str, bucket_name: str, file_name: str):
+    def __init__(
+            self,
+            project_name: str,
+            bucket_name: str,
+            file_name: str,
+            storage_client: storage.Client = None
+    ):
         """Inits ExportToGoogleCloudStorage with the respective Storage information
 
         Args:
             project_name: Name of the Google Cloud Project
             bucket_name: Name of the Google Cloud Storage bucket
             file_name: Name of the file within the bucket
+            storage_client: Existing Storage client, which should be reused for the upload. If it is
+                            not set, a new client is built
         """
         self.project_name = project_name
         self.bucket_name = bucket_name
         self.file_name = "scrapes/" + file_name
+        self.storage_client = storage_client
 
     def upload_to_cloud_bucket(self) -> None:
         """Uploads a blob into the Google Cloud Storage
@@ -23,9 +37,9 @@ class ExportToGoogleCloudStorage:
         Returns:
             None
         """
-        storage_client = build_gcp_client(storage, self.project_name)
+        storage_client = self.storage_client or build_gcp_client(storage, self.project_name)
         bucket = storage_client.get_bucket(self.bucket_name)
-        blob = bucket.blob(self.file_name)
+        blob = bucket.blob(self.file_name, chunk_size=UPLOAD_CHUNK_SIZE)
         blob.upload_from_filename(self.file_name)
 
 
@@ -1,9 +1,41 @@
 from __future__ import annotations
 
+import json
 import os
 import re
 
 import pandas as pd
+import pyarrow as pa
+
+# Columns with nested objects of the Places API response, which are saved as JSON strings
+NESTED_COLUMNS = ["geometry", "opening_hours", "photos", "plus_code", "types"]
+# Fixed schema of the exported scrapes, so that BigQuery does not need to guess the column types.
+# Unknown columns are dropped and missing ones are filled with nulls
+SCRAPE_SCHEMA = pa.schema([
+    ("business_status", pa.string()),
+    ("geometry", pa.string()),
+    ("icon", pa.string()),
+    ("icon_background_color", pa.string()),
+    ("icon_mask_base_uri", pa.string()),
+    ("name", pa.string()),
+    ("opening_hours", pa.string()),
+    ("permanently_closed", pa.bool_()),
+    ("photos", pa.string()),
+    ("place_id", pa.string()),
+    ("plus_code", pa.string()),
+    ("price_level", pa.int64()),
+    ("rating", pa.float64()),
+    ("reference", pa.string()),
+    ("scope", pa.string()),
+    ("types", pa.string()),
+    ("user_ratings_total", pa.int64()),
+    ("vicinity", pa.string()),
+    ("search_term", pa.string()),
+    ("radius_size_km", pa.float64()),
+    ("lat_long", pa.string()),
+    ("area_block", pa.string()),
+    ("country", pa.string()),
+])
 
 
 class GMapsScrapePostprocessor:
@@ -15,7 +47,8 @@ class GMapsScrapePostprocessor:
             big_radius_df: pd.DataFrame,
             small_radius_df: pd.DataFrame
     ) -> pd.DataFrame:
-        """triggers the run for the big and small radius and concatenates both dataframes to one
+        """triggers the run for the big and small radius and concatenates both dataframes to one.
+        Places, which were found by several overlapping circles, are only kept once
 
         Args:
             big_radius_df: Dataframe of the extracted data with the big search-radius
@@ -24,33 +57,46 @@ class GMapsScrapePostprocessor:
         Returns:
             unionized_df: dataframe with scraped data from the run with the big + small radius
         """
-        unionized_df = pd.concat([big_radius_df, small_radius_df])
-        unionized_df = unionized_df.reset_index()
+        unionized_df = pd.concat([big_radius_df, small_radius_df], ignore_index=True)
+        if "place_id" in unionized_df.columns:
+            # only rows with a place_id can be matched, the rows without one are all kept
+            place_ids = unionized_df["place_id"]
+            is_kept = place_ids.isna() | ~place_ids.duplicated(keep="first")
+            unionized_df = unionized_df[is_kept]
+            unionized_df.index = pd.RangeIndex(len(unionized_df))
         return unionized_df
 
     @staticmethod
-    def save_csv(scrape_df: pd.DataFrame, file_name: str, sub_folder: str) -> str:
-        """saves csv file without overwriting old versions
+    def save_parquet(scrape_df: pd.DataFrame, file_name: str, sub_folder: str) -> str:
+        """saves the scrape as zstd-compressed parquet file with the fixed SCRAPE_SCHEMA without
+        overwriting old versions. If the file name is already taken, the highest numeric suffix of
+        its existing versions is incremented (e.g. scrape_3.parquet)
 
         Args:
             scrape_df: Dataframe of the scraped Google Maps data
-            file_name: Name of the export csv-file
-            sub_folder: Name of the folder within the current directory in which the csv-file
+            file_name: Name of the export parquet-file
+            sub_folder: Name of the folder within the current directory in which the parquet-file
                         should be saved
 
         Returns:
-             file_name: Name of the exported csv
+             file_name: Name of the exported parquet-file
         """
-        i = 0
-        while True:
-            i += 1
-            file_path = f"./{sub_folder}/{file_name}"
-            if os.path.isfile(file_path):
-                file_name = re.sub(r"(_\d+)?\.csv", f"_{i}.csv", file_name)
-            else:
-                try:
-                    scrape_df.to_csv(file_path, index=False)
-                except FileNotFoundError:
-                    os.makedirs(sub_folder)
-                    scrape_df.to_csv(file_path, index=False)
-                return file_name
+        os.makedirs(sub_folder, exist_ok=True)
+        with os.scandir(sub_folder) as entries:
+            existing_file_names = {entry.name for entry in entries}
+
+        if file_name in existing_file_names:
+            stem, extension = os.path.splitext(file_name)
+            version_pattern = re.compile(rf"^{re.escape(stem)}_(\d+){re.escape(extension)}$")
+            versions = [version_pattern.match(name) for name in existing_file_names]
+            suffixes = [int(version.group(1)) for version in versions if version]
+            file_name = f"{stem}_{max(suffixes, default=0) + 1}{extension}"
+
+        export_df = scrape_df.reindex(columns=SCRAPE_SCHEMA.names)
+        for column in NESTED_COLUMNS:
+            export_df[column] = export_df[column].map(
+                lambda value: json.dumps(value) if isinstance(value, (dict, list)) else None
+            )
+        export_df.to_parquet(os.path.join(sub_folder, file_name), engine="pyarrow",
+                             compression="zstd", schema=SCRAPE_SCHEMA, index=False)
+        return file_name
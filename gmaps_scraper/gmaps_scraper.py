@@ -2,21 +2,42 @@
 
 from __future__ import annotations
 
+import logging
+import math
 import time
-from typing import Any, Iterable, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 
-import geopy.distance
 import googlemaps
+import numpy as np
 import pandas as pd
+import requests
+import requests_cache
+from google.cloud import storage
+from requests.adapters import HTTPAdapter
 
-from export_to_google_cloud import ExportToGoogleCloudStorage
+from export_to_google_cloud import ExportToGoogleCloudStorage, build_gcp_client
 from gmaps_scrape_postprocessor import GMapsScrapePostprocessor
-from input_file_preprocessor import InputFilePreprocessor
+from input_file_preprocessor import EARTH_RADIUS_KM, InputFilePreprocessor, read_input_file
+from rate_limiter import RateLimiter
+
+logger = logging.getLogger(__name__)
 
 
 class GoogleMapsScraper:
     """This class runs the scrape for the whole input file"""
     postprocessor = GMapsScrapePostprocessor()
+    # The requests are I/O-bound, so they are sent from a thread pool. The rate limiter keeps all
+    # threads of all areas together below the Places API limit of 50 queries per second
+    MAX_WORKERS = 20
+    MAX_QUERIES_PER_SECOND = 40
+    # the API returns up to 20 results per request and up to 3 pages per search
+    MAX_REQUESTS_PER_NODE = 3
+    PAGE_TOKEN_DELAYS_S = (2, 4)
+    RESPONSE_CACHE_NAME = ".gmaps_cache"
+    RESPONSE_CACHE_EXPIRE_S = 24 * 60 * 60
+    rate_limiter = RateLimiter(MAX_QUERIES_PER_SECOND)
+    _gmaps_clients: Dict[str, googlemaps.Client] = {}
 
     def __init__(
             self,
@@ -33,33 +54,120 @@ class GoogleMapsScraper:
             big_radius_km: Search Radius in km
             gcp_project_id: The Google Cloud Platform project id
             bucket_name: Name of the Google Cloud Storage bucket
-            input_file: File name of the excel sheet including the areas which should be scraped
+            input_file: File name of the input file (xlsx, csv or parquet) including the areas which
+                        should be scraped
         """
         self.api_key = api_key
-        self.gmaps = googlemaps.Client(key=api_key)
+        self.gmaps = self.get_gmaps_client(api_key)
         self.big_radius_km = big_radius_km
         self.diameter_km = big_radius_km * 2
         self.preprocessor = InputFilePreprocessor(big_radius_km)
-        self.small_radius_km = self.preprocessor.calculate_small_radius()
+        self.small_radius_km = self.preprocessor.small_radius
         self.gcp_project_id = gcp_project_id
         self.bucket_name = bucket_name
         self.input_file = input_file
 
-    def run(self) -> None:
-        """Runs the scrape throughout all rows within the input excel
+    @classmethod
+    def get_gmaps_client(cls, api_key: str) -> googlemaps.Client:
+        """Returns the Google Maps client of the API key. The client is only created on the first
+        call and then shared by all scrapers, so that every area reuses the same keep-alive
+        connections instead of paying a new TCP/TLS handshake. Successful responses are cached on
+        disk for a day, so that re-runs and runs after a crash don't pay the same requests again
+
+        Args:
+            api_key: Google Maps API key
+
+        Returns:
+            gmaps: Google Maps client, whose cached session holds one connection per worker thread
+        """
+        if api_key not in cls._gmaps_clients:
+            # urllib3's connection pool is thread-safe. Its default size of 10 connections would
+            # discard the connections of the other worker threads after every request
+            session = requests_cache.CachedSession(
+                cls.RESPONSE_CACHE_NAME,
+                expire_after=cls.RESPONSE_CACHE_EXPIRE_S,
+                allowable_methods=("GET",),
+                filter_fn=_is_successful_api_response,
+                # the API key is neither stored in the cache nor part of the cache keys
+                ignored_parameters=["key"]
+            )
+            # responses served from the cache never reach the adapter, so only the requests which
+            # are actually sent to the API wait for the rate limiter
+            session.mount("https://", _RateLimitedAdapter(cls.rate_limiter,
+                                                          pool_maxsize=cls.MAX_WORKERS))
+            # the client retries transient errors on its own. Its built-in throttle is not
+            # thread-safe, so it is only set to the same limit as the shared rate limiter
+            cls._gmaps_clients[api_key] = googlemaps.Client(
+                key=api_key,
+                requests_session=session,
+                retry_timeout=60,
+                queries_per_second=cls.MAX_QUERIES_PER_SECOND
+            )
+        return cls._gmaps_clients[api_key]
+
+    def run(self, confirm_costs: bool = True) -> None:
+        """Runs the scrape throughout all rows within the input excel. Before any request is sent,
+        the estimated costs of all areas are shown
+
+        Args:
+            confirm_costs: Waits for the user to confirm the estimated costs before scraping
+
+        Returns:
+            None
+        """
+        storage_client = build_gcp_client(storage, self.gcp_project_id)
+        # the areas are grouped by country, both in the cost table and in the scrape/upload order
+        lat_long_import_df = read_input_file(self.input_file).sort_values(
+            ["country", "area_block"], kind="stable"
+        )
+        area_scrapers = [
+            AreaScraper(self.api_key, self.big_radius_km, self.gcp_project_id, self.bucket_name,
+                        self.input_file, row)
+            for row in lat_long_import_df.to_dict(orient="records")
+        ]
+        self._estimate_costs(area_scrapers)
+        if confirm_costs:
+            input("Press Enter to continue or Ctrl-C to abort")
+
+        # the uploads run in the background, while the next area is scraped. One upload worker
+        # is enough for that and keeps the shared storage client single-threaded
+        with ThreadPoolExecutor(max_workers=1) as upload_pool:
+            uploads = []
+            for area_scraper in area_scrapers:
+                exported_file_name = area_scraper.scrape_area()
+                storage_exporter = ExportToGoogleCloudStorage(self.gcp_project_id,
+                                                              self.bucket_name,
+                                                              exported_file_name,
+                                                              storage_client)
+                uploads.append(upload_pool.submit(storage_exporter.upload_to_cloud_bucket))
+            # raises the exceptions of failed uploads
+            for upload in uploads:
+                upload.result()
+
+    @staticmethod
+    def _estimate_costs(area_scrapers: List[AreaScraper]) -> None:
+        """prints the estimated requests and costs of all areas as one table
+
+        Args:
+            area_scrapers: Scrapers of all areas within the input file
 
         Returns:
             None
         """
-        lat_long_import_df = pd.read_excel(self.input_file)
-        for row in lat_long_import_df.itertuples():
-            area_scraper = AreaScraper(self.api_key, self.big_radius_km, self.gcp_project_id,
-                                       self.bucket_name, self.input_file, row)
-            exported_file_name = area_scraper.scrape_area()
-            storage_exporter = ExportToGoogleCloudStorage(self.gcp_project_id,
-                                                          self.bucket_name,
-                                                          exported_file_name)
-            storage_exporter.upload_to_cloud_bucket()
+        total_requests = total_min_cost = total_max_cost = 0
+        max_requests_per_node = GoogleMapsScraper.MAX_REQUESTS_PER_NODE
+        print(f"{'Area':<30}{'Estimated requests':>25}{'Estimated costs':>25}")
+        for area_scraper in area_scrapers:
+            amount_of_requests, min_cost, max_cost = area_scraper._calculate_estimated_costs()
+            total_requests += amount_of_requests
+            total_min_cost += min_cost
+            total_max_cost += max_cost
+            print(f"{area_scraper.area_block:<30}"
+                  f"{f'{amount_of_requests} - {amount_of_requests * max_requests_per_node}':>25}"
+                  f"{f'${min_cost:.2f} - ${max_cost:.2f}':>25}")
+        print(f"{'Total':<30}"
+              f"{f'{total_requests} - {total_requests * max_requests_per_node}':>25}"
+              f"{f'${total_min_cost:.2f} - ${total_max_cost:.2f}':>25}")
 
 
 class AreaScraper(GoogleMapsScraper):
@@ -75,7 +183,7 @@ class AreaScraper(GoogleMapsScraper):
             gcp_project_id: str,
             bucket_name: str,
             input_file: str,
-            row: Iterable[Tuple[Any, ...]]
+            row: Dict[str, Any]
     ):
         """Inits GoogleMapsScraper with the respective setup
 
@@ -84,24 +192,47 @@ class AreaScraper(GoogleMapsScraper):
             big_radius_km: Search Radius in km
             gcp_project_id: The Google Cloud Platform project id
             bucket_name: Name of the Google Cloud Storage bucket
-            input_file: File name of the excel sheet including the areas which should be scraped
-            row: Row information from the input excel sheet
+            input_file: File name of the input file (xlsx, csv or parquet) including the areas which
+                        should be scraped
+            row: Row information from the input excel sheet as a dictionary of column name to value
         """
         super().__init__(api_key, big_radius_km, gcp_project_id, bucket_name, input_file)
-        self.area_block = row.area_block
-        self.country = row.country
+        self.area_block = row["area_block"]
+        self.country = row["country"]
         self.search_terms = self.preprocessor.search_terms_to_list(
-            row.search_terms_comma_separated
+            row["search_terms_comma_separated"]
         )
 
-        self.upper_left_coords = self.preprocessor.coords_to_tuple(row.upper_left_coordinates)
-        self.lower_right_coords = self.preprocessor.coords_to_tuple(row.lower_right_coordinates)
+        self.upper_left_coords = self.preprocessor.coords_to_tuple(row["upper_left_coordinates"])
+        self.lower_right_coords = self.preprocessor.coords_to_tuple(row["lower_right_coordinates"])
         self.upper_right_coords = (self.upper_left_coords[0], self.lower_right_coords[1])
+        self.preprocessor.validate_coordinates_position(self.upper_left_coords,
+                                                        self.lower_right_coords)
 
         self.amount_of_requests_per_row, self.amount_of_requests_per_col = \
             self.preprocessor.calculate_amount_of_requests(self.upper_left_coords,
                                                            self.lower_right_coords,
                                                            self.upper_right_coords)
+        self._n_nodes = self.amount_of_requests_per_row * self.amount_of_requests_per_col
+
+        # The big circles start one radius, the small circles in between them one diameter away
+        # from the upper left corner. Both grids have the same shape and step, so they are built
+        # in one pass and stored as arrays of latitudes per row and longitudes per node
+        radius_types = ["big", "small"]
+        start_distances_km = [self.big_radius_km, self.diameter_km]
+        latitudes, longitudes = self._build_node_grid(
+            np.array([self.add_km_to_latitude(self.upper_left_coords, start_distance_km)
+                      for start_distance_km in start_distances_km]),
+            np.array([self.add_km_to_longitude(self.upper_left_coords, start_distance_km)
+                      for start_distance_km in start_distances_km]),
+            self.diameter_km,
+            self.amount_of_requests_per_col,
+            self.amount_of_requests_per_row
+        )
+        self._node_grids = {
+            radius_type: (latitudes[grid_number], longitudes[grid_number])
+            for grid_number, radius_type in enumerate(radius_types)
+        }
 
     def scrape_area(self) -> str:
         """Scrapes the specific area row within the excel sheet with the big and small radius
@@ -112,9 +243,9 @@ class AreaScraper(GoogleMapsScraper):
         big_radius_df = self._scrape_single_radius("big")
         small_radius_df = self._scrape_single_radius("small")
         unionised_df = self.postprocessor.union_dataframes(big_radius_df, small_radius_df)
-        file_name = self.postprocessor.save_csv(
+        file_name = self.postprocessor.save_parquet(
             unionised_df,
-            f"{self.area_block}_googlemaps_scrape.csv",
+            f"{self.area_block}_googlemaps_scrape.parquet",
             sub_folder="scrapes"
         )
         return file_name
@@ -128,22 +259,15 @@ class AreaScraper(GoogleMapsScraper):
         Returns:
             area_radius_df: dataframe with the scraped data from the requested radius
         """
-        self.preprocessor.validate_coordinates_position(self.upper_left_coords,
-                                                        self.lower_right_coords)
-        self._calculate_estimated_costs()
-
         if radius_type == "big":
-            start_longitude = self.add_km_to_longitude(self.upper_left_coords, self.big_radius_km)
-            start_latitude = self.add_km_to_latitude(self.upper_left_coords, self.big_radius_km)
             radius_km = self.big_radius_km
         elif radius_type == "small":
-            start_longitude = self.add_km_to_longitude(self.upper_left_coords, self.diameter_km)
-            start_latitude = self.add_km_to_latitude(self.upper_left_coords, self.diameter_km)
             radius_km = self.small_radius_km
         else:
             raise ValueError("Please use 'big' or 'small' as the radius type")
 
-        area_radius_df = self._iterate_through_nodes(start_latitude, start_longitude, radius_km)
+        latitudes, longitudes = self._node_grids[radius_type]
+        area_radius_df = self._iterate_through_nodes(latitudes, longitudes, radius_km)
         return area_radius_df
 
     @staticmethod
@@ -157,10 +281,7 @@ class AreaScraper(GoogleMapsScraper):
         Returns:
             new_latitude: Previous latitude + great-circle-distance to the south
         """
-        added_diameter_distance = geopy.distance.distance(kilometers=added_distance_km)
-        new_latitude = added_diameter_distance.destination(point=previous_node,
-                                                           bearing=180).latitude
-        return new_latitude
+        return _add_km_lat(previous_node[0], added_distance_km)
 
     @staticmethod
     def add_km_to_longitude(previous_node: Tuple[float, float], added_distance_km: float) -> float:
@@ -173,105 +294,137 @@ class AreaScraper(GoogleMapsScraper):
         Returns:
             new_longitude: Previous latitude + great-circle distance to the east
         """
-        added_diameter_distance = geopy.distance.distance(kilometers=added_distance_km)
-        new_longitude = added_diameter_distance.destination(point=previous_node,
-                                                            bearing=90).longitude
-        return new_longitude
+        return _add_km_lon(*previous_node, added_distance_km)
 
-    def _calculate_estimated_costs(self) -> None:
-        """shows the estimated cost before running. as you can do up to 3 requests per node, the
-        price will vary in this range. After printing the cost, sleep for 5s in case that script
-        needs to be canceled
+    def _calculate_estimated_costs(self) -> Tuple[int, float, float]:
+        """estimates the costs of the big and the small radius run. As you can do up to 3 requests
+        per node, the price will vary in this range
 
         Returns:
-            None
+            amount_of_requests: Minimum amount of API requests for the area
+            min_cost: Estimated costs if every node needs one request
+            max_cost: Estimated costs if every node needs three requests
         """
         PRICE_PER_REQUEST = 0.002
-        MAX_REQUESTS_PER_NODE = 3
-        amount_of_coordinates = self.amount_of_requests_per_row * self.amount_of_requests_per_col
+        AMOUNT_OF_RADII = 2
         amount_of_search_terms = len(self.search_terms)
-        amount_of_requests = amount_of_coordinates * amount_of_search_terms
+        amount_of_requests = AMOUNT_OF_RADII * self._n_nodes * amount_of_search_terms
         min_cost = round(amount_of_requests * PRICE_PER_REQUEST, 2)
-        max_cost = round(amount_of_requests * MAX_REQUESTS_PER_NODE * PRICE_PER_REQUEST, 2)
-
-        print(
-            f"Estimated requests for {self.area_block}: {amount_of_requests} - """,
-            f"{amount_of_requests * 3}"
-        )
-        print(f"Estimated costs for {self.area_block}: ${min_cost} - ${max_cost}")
-        time.sleep(5)
+        max_cost = round(amount_of_requests * self.MAX_REQUESTS_PER_NODE * PRICE_PER_REQUEST, 2)
+        return amount_of_requests, min_cost, max_cost
 
     def _iterate_through_nodes(
-        self, start_latitude: float, start_longitude: float, radius_km: float
+        self, latitudes: np.ndarray, longitudes: np.ndarray, radius_km: float
     ) -> pd.DataFrame:
-        """runs iterations through vertical and horizontal lines, which are one diameter away from
-        each other
+        """runs through the nodes of vertical and horizontal lines, which are one diameter away from
+        each other. The API requests for every node and search term are sent concurrently
 
         Args:
-            start_latitude: Latitude at which the iteration starts
-            start_longitude: Longitude at which the iteration starts
+            latitudes: Latitude of every row of nodes [shape: (rows,)]
+            longitudes: Longitude of every node [shape: (rows, columns)]
             radius_km: Radius in which the Google Maps API looks up locations
 
         Returns:
             area_df: dataframe with the scraped data from the requested radius
         """
-        scrape_node = (start_latitude, start_longitude)
-        area_df = pd.DataFrame()
-        latitude = start_latitude
-
-        # go through each node within a vertical line
-        for row_number in range(self.amount_of_requests_per_col):
-            longitude = start_longitude
-            latitude = self.get_latitude_in_iteration(latitude,
-                                                      scrape_node,
-                                                      self.diameter_km,
-                                                      row_number)
-
-            # go through each node within a horizontal line
-            for column_number in range(self.amount_of_requests_per_row):
-                longitude = self.get_longitude_in_iteration(longitude,
-                                                            scrape_node,
-                                                            self.diameter_km,
-                                                            column_number)
-                scrape_node = (latitude, longitude)
-
-                area_df = self._add_area_data_to_api_scrape(radius_km, area_df, scrape_node)
-
+        # every row shares its latitude, so it is broadcast to the grid and both are flattened
+        node_latitudes = np.broadcast_to(latitudes[:, np.newaxis], longitudes.shape).ravel()
+        nodes = list(zip(node_latitudes.tolist(), longitudes.ravel().tolist()))
+        node_lat_longs = [f"{latitude}, {longitude}" for latitude, longitude in nodes]
+        jobs = [(node, lat_long, search_term)
+                for node, lat_long in zip(nodes, node_lat_longs)
+                for search_term in self.search_terms]
+        with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
+            node_dfs = [
+                page_df
+                for page_dfs in executor.map(
+                    lambda job: self._get_area_data_from_node(radius_km, *job), jobs
+                )
+                for page_df in page_dfs
+            ]
+        # empty responses are skipped, so a whole radius can be without any results
+        area_df = pd.concat(node_dfs, ignore_index=True) if node_dfs else pd.DataFrame()
+        # these columns are the same for all nodes, so they are only filled in once
+        area_df = area_df.assign(
+            radius_size_km=radius_km,
+            area_block=self.area_block,
+            country=self.country
+        )
         return area_df
 
-    def _add_area_data_to_api_scrape(
+    @staticmethod
+    def _build_node_grid(
+            start_latitude: np.ndarray | float,
+            start_longitude: np.ndarray | float,
+            step_km: float,
+            n_rows: int,
+            n_cols: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """calculates all nodes of the iteration at once. Every row is one step to the south of the
+        previous one and every node is one step to the east of the previous node within its row.
+        As the longitude distance of one step depends on the latitude, the longitudes are
+        calculated per row. Several grids of the same shape can be built at once by passing
+        arrays of start coordinates
+
+        Args:
+            start_latitude: Latitude of the first node [shape: () or (n_grids,)]
+            start_longitude: Longitude of the first node [shape: () or (n_grids,)]
+            step_km: Distance in between two neighbouring nodes in km
+            n_rows: Amount of nodes per vertical line
+            n_cols: Amount of nodes per horizontal line
+
+        Returns:
+            latitudes: Latitude of every row [shape: (n_rows,) or (n_grids, n_rows)]
+            longitudes: Longitude of every node [shape: (n_rows, n_cols) or
+                        (n_grids, n_rows, n_cols)]
+        """
+        start_longitude = np.asarray(start_longitude, dtype=np.float64)
+        # the angular step and its tangent are the same for every node
+        angular_step = step_km / EARTH_RADIUS_KM
+        tan_angular_step = math.tan(angular_step)
+        # along a meridian, great-circle distances simply add up to the latitude
+        latitudes = (np.radians(start_latitude, dtype=np.float64)[..., np.newaxis]
+                     - np.arange(n_rows) * angular_step)
+        # the eastward step only depends on the row's latitude, so it is calculated once per row.
+        # For a bearing of 90° the inverse haversine formula reduces to atan(tan(d) / cos(lat))
+        longitude_steps = np.arctan(tan_angular_step / np.cos(latitudes))
+        column_numbers = np.arange(n_cols, dtype=np.float64)
+        longitudes = (start_longitude[..., np.newaxis, np.newaxis]
+                      + np.degrees(longitude_steps)[..., np.newaxis] * column_numbers)
+        return np.degrees(latitudes), longitudes
+
+    def _get_area_data_from_node(
             self,
             radius_km: float,
-            area_df: pd.DataFrame,
-            node: Tuple[float, float]
-    ) -> pd.DataFrame:
-        """fills in the node information into the dataframe
+            node: Tuple[float, float],
+            lat_long: str,
+            search_term: str
+    ) -> List[pd.DataFrame]:
+        """requests the data of one search term at one node and fills in the node information
 
         Args:
             radius_km: Radius in which the Google Maps API looks up locations
-            area_df: Previous DataFrame of the iteration
             node: current coordinate node
+            lat_long: current coordinate node as comma-separated string
+            search_term: Current term looked up in Google Maps
 
         Returns:
-            area_df: Previous DataFrame added with current area data
+            page_dfs: DataFrames with the API results and the node information per result page
         """
-        for search_term in self.search_terms:
-            df_temp = self._get_data_from_location_node(node, search_term, radius_km)
-            df_temp["search_term"] = search_term
-            df_temp["radius_size_km"] = radius_km
-            df_temp["lat_long"] = ", ".join(str(coord_value) for coord_value in node)
-            df_temp["area_block"] = self.area_block
-            df_temp["country"] = self.country
-            area_df = area_df.append(df_temp)
-        return area_df
+        page_dfs = [
+            page_df.assign(search_term=search_term, lat_long=lat_long)
+            for page_df in self._get_data_from_location_node(node, search_term, radius_km)
+        ]
+        return page_dfs
 
     def _get_data_from_location_node(
         self,
         current_node: Tuple[float, float],
         search_term: str,
         radius_km: float
-    ) -> pd.DataFrame:
-        """extracts location information from all request-pages into a dataframe
+    ) -> List[pd.DataFrame]:
+        """extracts location information from all request-pages into dataframes. Pages without
+        any results are skipped
 
         Args:
             current_node: Coordinates for the current node
@@ -279,25 +432,59 @@ class AreaScraper(GoogleMapsScraper):
             radius_km: Search radius in km
 
         Returns:
-            df: dataframe with Google Maps API results for the current node
+            page_dfs: dataframes with Google Maps API results for the current node
         """
-        request = self._build_api_request(radius_km, current_node, search_term)
-        api_result_df = self._get_data_from_api_request(request)
-        # One Google Maps API only shows the first 20 results. If there are more then 20, this
-        # requests the next results
-        try:
-            next_page = request["next_page_token"]
-        except KeyError:
-            next_page = None
-        i = 1
-        while next_page in request.keys():
-            i += 1
-            if i > 3:
-                raise Exception(f"""API request unexpectedly exceeded 3 requests for one node.
-                                Search_term: {search_term}, Node: {current_node}""")
-            request = self._build_api_request(radius_km, current_node, search_term, next_page)
-            api_result_df = self._append_api_results_to_dataframe(request, api_result_df)
-        return api_result_df
+        page_dfs = []
+        next_page = None
+        # One Google Maps API request only shows the first 20 results. If there are more than 20,
+        # up to two more pages are requested with the next page token
+        for page_number in range(self.MAX_REQUESTS_PER_NODE):
+            if page_number == 0:
+                request = self._build_api_request(radius_km, current_node, search_term)
+            else:
+                request = self._build_next_page_request(radius_km, current_node, search_term,
+                                                        next_page)
+                if request is None:
+                    break
+            if request["results"]:
+                page_dfs.append(self._get_data_from_api_request(request))
+            next_page = request.get("next_page_token")
+            if not next_page:
+                break
+        return page_dfs
+
+    def _build_next_page_request(
+        self,
+        radius_km: float,
+        location_node: Tuple[float, float],
+        search_term: str,
+        page_token: str
+    ) -> Optional[dict]:
+        """requests the next page of results. The page token only becomes valid a short time after
+        it was issued and until then, the API answers with INVALID_REQUEST. That's why the request
+        is delayed and retried with an exponential backoff
+
+        Args:
+            radius_km: Search radius in km
+            location_node: Coordinates for the current node
+            search_term: Current term looked up in Google Maps
+            page_token: Token of the previous request that returns up to 20 additional results
+
+        Returns:
+            request: The output from the Google Maps GET API-request or None, if the page token
+                     was still invalid after all retries
+        """
+        for delay_s in self.PAGE_TOKEN_DELAYS_S:
+            time.sleep(delay_s)
+            try:
+                return self._build_api_request(radius_km, location_node, search_term, page_token)
+            except googlemaps.exceptions.ApiError as error:
+                if error.status != "INVALID_REQUEST":
+                    raise
+        # one node's missing page must not abort the scrape of all areas
+        logger.warning("The next page of '%s' at %s was skipped, as its page token stayed invalid",
+                       search_term, location_node)
+        return None
 
     def _build_api_request(
         self,
@@ -320,6 +507,8 @@ class AreaScraper(GoogleMapsScraper):
             request: The output from the Google Maps GET API-request
         """
         radius_m = radius_km * 1000
+        # rounded to ~1m, so that floating point noise does not cause cache misses
+        location_node = (round(location_node[0], 5), round(location_node[1], 5))
         request = self.gmaps.places_nearby(
             location=location_node,
             keyword=search_term,
@@ -328,54 +517,6 @@ class AreaScraper(GoogleMapsScraper):
         )
         return request
 
-    @staticmethod
-    def get_longitude_in_iteration(
-            start_longitude: float,
-            node: Tuple[float, float],
-            diameter_km: float,
-            column_number: int
-    ) -> float:
-        """In case the first node is the first one, this does not calculate the next longitude
-
-        Args:
-            start_longitude: Longitude coordinates at which the iteration starts
-            node: Current coordinates-node
-            diameter_km: Diameter of the search radius in kilometers
-            column_number: The current count of the iteration within the vertical line
-
-        Returns:
-            longitude: Longitude coordinates at which the API request should extract information
-        """
-        if column_number == 0:
-            longitude = start_longitude
-        else:
-            longitude = AreaScraper.add_km_to_longitude(node, diameter_km)
-        return longitude
-
-    @staticmethod
-    def get_latitude_in_iteration(
-            start_latitude: float,
-            node: Tuple[float, float],
-            diameter_km: float,
-            row_number: int
-    ) -> float:
-        """In case the first node is the first one, this does not calculate the next latitude
-
-        Args:
-            start_latitude: Latitude coordinates at which the iteration starts
-            node: Current coordinates-node
-            diameter_km: Diameter of the search radius in kilometers
-            row_number: The current count of the iteration within the horizontal line
-
-        Returns:
-            latitude: Latitude coordinates at which the API request should extract information
-        """
-        if row_number == 0:
-            latitude = start_latitude
-        else:
-            latitude = AreaScraper.add_km_to_latitude(node, diameter_km)
-        return latitude
-
     @staticmethod
     def _get_data_from_api_request(request: dict) -> pd.DataFrame:
         """Pulls data from the gmaps places API request
@@ -390,21 +531,91 @@ class AreaScraper(GoogleMapsScraper):
         api_result_df = pd.DataFrame(result)
         return api_result_df
 
-    @staticmethod
-    def _append_api_results_to_dataframe(
-        request: dict,
-        main_df: pd.DataFrame
-    ) -> pd.DataFrame:
-        """Takes the results from the API request and appends them to the previous results
+
+class _RateLimitedAdapter(HTTPAdapter):
+    """HTTPAdapter, which waits for the shared rate limiter before a request is sent"""
+    def __init__(self, rate_limiter: RateLimiter, **kwargs):
+        """Inits _RateLimitedAdapter with the shared rate limiter
 
         Args:
-            request: Google Maps API request
-            main_df: Dataframe which contains the previous results of the current location node
+            rate_limiter: Rate limiter of all scraper threads
+            **kwargs: Arguments of the HTTPAdapter (e.g. pool_maxsize)
+        """
+        self.rate_limiter = rate_limiter
+        super().__init__(**kwargs)
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        """waits for the next free time slot and sends the request
+
+        Args:
+            request: Prepared request to the Google Maps API
+            **kwargs: Arguments of HTTPAdapter.send
 
         Returns:
-            main_df: Appended dataframe with previous and current results of the current location
-                     node
+            response: Response of the Google Maps API
         """
-        df_temp = pd.DataFrame(request["results"])
-        main_df = main_df.append(df_temp)
-        return main_df
+        self.rate_limiter.wait()
+        return super().send(request, **kwargs)
+
+
+def _is_successful_api_response(response: requests.Response) -> bool:
+    """checks whether a response should be cached. The Places API also answers errors like an
+    invalid page token or an exceeded quota with the status code 200, so the status in the body is
+    checked as well. Responses with a next page token are not cached, as the token expires within
+    minutes and the next page could not be requested anymore after a restart. Because of that, a
+    next page always follows a response from the API itself and its page token delays are never
+    spent on cached responses
+
+    Args:
+        response: Response of a Google Maps API request
+
+    Returns:
+        is_successful: True if the request succeeded with or without results and has no next page
+    """
+    if response.status_code != 200:
+        return False
+    try:
+        body = response.json()
+    except ValueError:
+        return False
+    return body.get("status") in ("OK", "ZERO_RESULTS") and "next_page_token" not in body
+
+
+def _add_km_lat(latitude: float, distance_km: float) -> float:
+    """calculates the latitude after moving a distance along the meridian to the south
+
+    Args:
+        latitude: Latitude of the starting point in degrees
+        distance_km: Great-circle distance which is added in km
+
+    Returns:
+        new_latitude: Latitude of the destination in degrees
+    """
+    latitude = math.radians(latitude)
+    angular_distance = distance_km / EARTH_RADIUS_KM
+    return math.degrees(math.asin(math.sin(latitude) * math.cos(angular_distance)
+                                  - math.cos(latitude) * math.sin(angular_distance)))
+
+
+def _add_km_lon(latitude: float, longitude: float, distance_km: float) -> float:
+    """calculates the longitude after moving a distance along a great circle to the east
+
+    Args:
+        latitude: Latitude of the starting point in degrees
+        longitude: Longitude of the starting point in degrees
+        distance_km: Great-circle distance which is added in km
+
+    Returns:
+        new_longitude: Longitude of the destination in degrees
+    """
+    latitude = math.radians(latitude)
+    angular_distance = distance_km / EARTH_RADIUS_KM
+    # every sine and cosine is used twice, so they are only evaluated once
+    sin_latitude, cos_latitude = math.sin(latitude), math.cos(latitude)
+    sin_distance, cos_distance = math.sin(angular_distance), math.cos(angular_distance)
+    # sin() of the new latitude, whose asin() is never needed itself
+    sin_new_latitude = sin_latitude * cos_distance
+    return math.degrees(math.radians(longitude) + math.atan2(
+        sin_distance * cos_latitude,
+        cos_distance - sin_latitude * sin_new_latitude
+    ))
@@ -2,36 +2,47 @@
 Copy of the Google Cloud Function which gets triggered by a file creation in the Cloud Storage
 bucket
 """
+from functools import lru_cache
+
 import google.cloud.bigquery
 import yaml
 from google.cloud import bigquery
 
 from gmaps_scraper.export_to_google_cloud import build_gcp_client
 
+# libyaml's faster loader, if the installed PyYAML was built with it
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 
+@lru_cache(maxsize=1)
 def get_yaml_settings() -> dict:
-    """reads the configuration-file (yaml)
+    """reads the configuration-file (yaml). It is only parsed on the first invocation of a function
+    instance, warm invocations reuse the cached settings
 
     Returns:
         setup: Dictionary with all configuration variables
     """
     with open("../../setup.yaml", "r") as file:
-        setup = yaml.load(file)
+        setup = yaml.load(file, Loader=SafeLoader)
     return setup
 
 
-def load_csv_into_bigquery(uri: str, table_id: str, client: google.cloud.bigquery.Client):
+def load_parquet_into_bigquery(uri: str, table_id: str, client: google.cloud.bigquery.Client):
+    # the parquet files carry the fixed schema of the scraper, so no schema detection is needed.
+    # Tables created by the former csv loads may lack some of its columns, which are added
     job_config = bigquery.LoadJobConfig(
-        skip_leading_rows=1,
-        source_format=bigquery.SourceFormat.CSV,
-        autodetect=True,
-        schema_update_options="ALLOW_FIELD_ADDITION"
+        source_format=bigquery.SourceFormat.PARQUET,
+        write_disposition=bigquery.WriteDisposition.WRITE_APPEND,
+        schema_update_options=[bigquery.SchemaUpdateOption.ALLOW_FIELD_ADDITION]
     )
     load_job = client.load_table_from_uri(uri, table_id, job_config=job_config)
     load_job.result()
 
 
-def push_csv_to_bigquery(event: dict):
+def push_parquet_to_bigquery(event: dict):
     setup = get_yaml_settings()
     project_id = setup["GOOGLE_CLOUD"]["project_id"]
     dataset_name = setup["GOOGLE_CLOUD"]["BigQuery"]["dataset"]
@@ -42,4 +53,4 @@ def push_csv_to_bigquery(event: dict):
     uri = f"gs://{file['bucket']}/{file['name']}"
     client = build_gcp_client(bigquery, project_id)
 
-    load_csv_into_bigquery(uri, table_id, client)
+    load_parquet_into_bigquery(uri, table_id, client)
@@ -1,17 +1,52 @@
 from __future__ import annotations
 
-from ast import literal_eval
-from math import floor, sqrt
+import copy
+import json
+import os
+import re
+from collections import OrderedDict
+from functools import cached_property
+from math import atan2, cos, floor, radians, sin, sqrt
 from typing import List, Tuple
 import yaml
 
-import geopy.distance
+import numpy as np
+import pandas as pd
+
+# the libyaml bindings parse several times faster, but are not part of every PyYAML installation
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+# mean earth radius in km
+EARTH_RADIUS_KM = 6371.0088
+# columns of the input file which are used by the scraper
+INPUT_COLUMNS = [
+    "country",
+    "area_block",
+    "upper_left_coordinates",
+    "lower_right_coordinates",
+    "search_terms_comma_separated"
+]
+# a search term starts with any character except a comma or whitespace and ends before a comma
+_TERM_RE = re.compile(r"[^,\s][^,]*")
+# parsed configuration-files by absolute path with the (mtime, size) they were parsed at
+YAML_SETUP_CACHE_SIZE = 16
+_YAML_SETUP_CACHE: OrderedDict[str, Tuple[Tuple[int, int], dict]] = OrderedDict()
 
 
 class InputFilePreprocessor:
     """
     This class contains methods that are used to pre-process the scraped data from the GMaps API
     """
+    # these constants don't depend on the radius, so they are shared by all preprocessors
+    MAX_ABS_LATITUDE = 90
+    MAX_ABS_LONGITUDE = 180
+    MIN_CIRCLES_PER_PLANE = 2
+    # sqrt(2*d²) - d = d * (sqrt(2) - 1)
+    SMALL_RADIUS_FACTOR = sqrt(2) - 1
+
     def __init__(self, big_radius_km: float):
         """Inits InputFilePreprocessor with the radius from the setup file.
 
@@ -37,21 +72,22 @@ class InputFilePreprocessor:
             amount_of_requests_per_col: Amount of API calls per vertical line of the iteration
             amount_of_requests_per_row: Amount of API calls per horizontal line of the iteration
         """
-        area_width_km = geopy.distance.geodesic(upper_left_coords, upper_right_coords).km
-        area_length_km = geopy.distance.geodesic(lower_right_coords, upper_right_coords).km
+        area_width_km = great_circle_distance_km(upper_left_coords, upper_right_coords)
+        area_length_km = great_circle_distance_km(lower_right_coords, upper_right_coords)
         self.validate_amount_of_requests(area_width_km, self.diameter_km)
         self.validate_amount_of_requests(area_length_km, self.diameter_km)
         amount_of_requests_per_row = floor(area_width_km / self.diameter_km)
         amount_of_requests_per_col = floor(area_length_km / self.diameter_km)
         return amount_of_requests_per_row, amount_of_requests_per_col
 
-    def calculate_small_radius(self) -> float:
+    @cached_property
+    def small_radius(self) -> float:
         """As we have a square of 4 big radius circles, you can build a diagonal line through the
         center of two squares to create a right triangle, which allows you to use the Pythagorean
         theorem. As the legs (a, b) are the same and the distance in between two circle-centers
         equal one diameter, the formula to get the hypotenuse is sqrt(2*d²).
         Now you have a diagonal line including 2 radii and the diameter of the small radius, which
-        leads to the final formula: sqrt(2d²)-d
+        leads to the final formula: sqrt(2d²)-d = d(sqrt(2)-1)
         Visualization: /images/small_circle_calculation.jpg
 
         Returns:
@@ -59,9 +95,17 @@ class InputFilePreprocessor:
         """
         if self.diameter_km <= 0:
             raise ValueError("diameter must be bigger than 0!")
-        small_radius_km = sqrt(2 * (self.diameter_km ** 2)) - self.diameter_km
+        small_radius_km = self.diameter_km * self.SMALL_RADIUS_FACTOR
         return small_radius_km
 
+    def calculate_small_radius(self) -> float:
+        """returns the small radius, which is only calculated once per preprocessor
+
+        Returns:
+            small_radius_km: Search radius for the small-radius-iteration
+        """
+        return self.small_radius
+
     def validate_coordinates_position(
             self,
             upper_left_coords: Tuple[float, float],
@@ -78,8 +122,7 @@ class InputFilePreprocessor:
         Returns:
             None
         """
-        self.validate_coordinates_values(upper_left_coords)
-        self.validate_coordinates_values(lower_right_coords)
+        self.validate_coordinates_batch([upper_left_coords, lower_right_coords])
 
         if lower_right_coords[0] > upper_left_coords[0]:
             raise Exception("""The lower right coordinates' latitude must not be higher than the
@@ -98,9 +141,8 @@ class InputFilePreprocessor:
             search_terms: List of search terms
         """
         self._validate_search_terms(search_terms)
-        search_terms = search_terms.split(",")
-        stripped_search_terms = [term.strip() for term in search_terms]
-        cleaned_search_terms = [term for term in stripped_search_terms if term]
+        # empty and whitespace-only terms don't match, so only the trailing whitespace is left
+        cleaned_search_terms = [term.rstrip() for term in _TERM_RE.findall(search_terms)]
         return cleaned_search_terms
 
     @staticmethod
@@ -127,31 +169,47 @@ class InputFilePreprocessor:
         Returns:
             coord_tuple: Google Maps coordinates from the excel sheet as a tuple
         """
+        coord_parts = coords.strip().lstrip("(").rstrip(")").split(",")
+        if len(coord_parts) != 2:
+            raise Exception("The two coordinates must be separated by a comma")
         try:
-            coord_tuple = literal_eval(coords)
+            coord_tuple = (float(coord_parts[0]), float(coord_parts[1]))
             return coord_tuple
         except ValueError:
             raise Exception("Both coordinates must be floats")
-        except SyntaxError:
-            raise Exception("The two coordinates must be separated by a comma")
 
-    @staticmethod
-    def validate_coordinates_values(coords: Tuple[float, float]) -> None:
+    @classmethod
+    def validate_coordinates_values(cls, coords: Tuple[float, float]) -> None:
         """validates whether latitude or longitude values are in the right range
 
         Args:
-            coords:
+            coords: Latitude/longitude coordinates
 
         Returns:
             None
         """
-        if not 90 > coords[0] > -90:
+        cls.validate_coordinates_batch(np.array([coords], dtype=np.float64))
+
+    @classmethod
+    def validate_coordinates_batch(cls, coords_array: np.ndarray) -> None:
+        """validates whether the latitude or longitude values of many coordinates are in the right
+        range at once
+
+        Args:
+            coords_array: Latitude/longitude coordinates [shape: (n, 2)]
+
+        Returns:
+            None
+        """
+        coords_array = np.asarray(coords_array, dtype=np.float64)
+        # the comparisons are negated, so that missing (NaN) values are invalid as well
+        if not np.all(np.abs(coords_array[:, 0]) < cls.MAX_ABS_LATITUDE):
             raise ValueError("Latitude must be in between 90° and -90°")
-        if not 180 > coords[1] > -180:
+        if not np.all(np.abs(coords_array[:, 1]) < cls.MAX_ABS_LONGITUDE):
             raise ValueError("Longitude must be in between 180° and -180°")
 
-    @staticmethod
-    def validate_amount_of_requests(geodesic_distance, diameter) -> None:
+    @classmethod
+    def validate_amount_of_requests(cls, geodesic_distance, diameter) -> None:
         """As the code needs to build 4 circles before calculating the small circle in the middle,
         you need at least 4 circles, which means 2 diameters on a horizontal and a vertical line.
 
@@ -159,17 +217,119 @@ class InputFilePreprocessor:
             None
         """
         amount_of_circles_per_plane = geodesic_distance/diameter
-        if 2 > amount_of_circles_per_plane:
+        if cls.MIN_CIRCLES_PER_PLANE > amount_of_circles_per_plane:
             raise ValueError("""The search field is too small/the radius to big. Get sure that the
             radius fits into the area at least 4 times on the horizontal and vertical plane""")
 
 
-def get_yaml_setup() -> dict:
-    """reads the configuration-file (yaml)
+def great_circle_distance_km(
+        first_coords: Tuple[float, float],
+        second_coords: Tuple[float, float]
+) -> float:
+    """calculates the great-circle distance in between two coordinates with the haversine
+    formula. The arctan2 form stays accurate for very short and for antipodal distances, where
+    arcsin and arccos run into rounding errors
+
+    Args:
+        first_coords: Latitude/longitude of the first point in degrees
+        second_coords: Latitude/longitude of the second point in degrees
+
+    Returns:
+        distance_km: Distance in between both points in km
+    """
+    first_latitude, first_longitude = map(radians, first_coords)
+    second_latitude, second_longitude = map(radians, second_coords)
+    a = (sin((second_latitude - first_latitude) / 2) ** 2
+         + cos(first_latitude) * cos(second_latitude)
+         * sin((second_longitude - first_longitude) / 2) ** 2)
+    # rounding can push a slightly out of [0, 1] for (nearly) antipodal points
+    a = min(1.0, max(0.0, a))
+    return 2 * EARTH_RADIUS_KM * atan2(sqrt(a), sqrt(1 - a))
+
+
+def get_yaml_setup(file_path: str = "../setup.yaml") -> dict:
+    """reads the configuration-file (yaml). Parsed files are cached by their absolute path and only
+    parsed again if their modification time or size changed
+
+    Args:
+        file_path: File path of the configuration-file
 
     Returns:
         setup: Dictionary with all configuration variables
     """
-    with open('../setup.yaml', 'r') as file:
-        setup = yaml.load(file, Loader=yaml.FullLoader)
+    absolute_path = os.path.abspath(file_path)
+    file_stat = os.stat(absolute_path)
+    file_version = (file_stat.st_mtime_ns, file_stat.st_size)
+
+    cached_setup = _YAML_SETUP_CACHE.get(absolute_path)
+    if cached_setup is not None and cached_setup[0] == file_version:
+        _YAML_SETUP_CACHE.move_to_end(absolute_path)
+        setup = cached_setup[1]
+    else:
+        setup = _parse_setup_file(absolute_path, file_version)
+        _YAML_SETUP_CACHE[absolute_path] = (file_version, setup)
+        _YAML_SETUP_CACHE.move_to_end(absolute_path)
+        if len(_YAML_SETUP_CACHE) > YAML_SETUP_CACHE_SIZE:
+            _YAML_SETUP_CACHE.popitem(last=False)
+    # the callers get a copy, so that they can't modify the cached setup
+    return copy.deepcopy(setup)
+
+
+def _parse_setup_file(yaml_path: str, file_version: Tuple[int, int]) -> dict:
+    """parses the configuration-file. As JSON is parsed an order of magnitude faster than YAML, the
+    parsed setup is stored in a JSON sidecar file (e.g. setup.yaml.json) together with the
+    (mtime, size) of the yaml file. The sidecar is loaded instead, as long as the yaml file still
+    has exactly this version
+
+    Args:
+        yaml_path: Absolute file path of the configuration-file
+        file_version: Modification time in ns and size of the configuration-file
+
+    Returns:
+        setup: Dictionary with all configuration variables
+    """
+    json_path = yaml_path + ".json"
+    try:
+        with open(json_path, 'r') as file:
+            sidecar = json.load(file)
+        # comparing the modification times instead would return stale settings, if the yaml file
+        # was changed within the same timestamp tick or restored with its old modification time
+        if sidecar["yaml_version"] == list(file_version):
+            return sidecar["setup"]
+    except (OSError, ValueError, TypeError, KeyError):
+        # the sidecar file is missing or broken, so the yaml file is parsed
+        pass
+
+    with open(yaml_path, 'r') as file:
+        setup = yaml.load(file, Loader=SafeLoader)
+    try:
+        json_setup = json.dumps({"yaml_version": list(file_version), "setup": setup})
+        with open(json_path, 'w') as file:
+            file.write(json_setup)
+    except (OSError, TypeError):
+        # the folder is read-only or the yaml file contains values without a JSON type (e.g. dates)
+        pass
     return setup
+
+
+def read_input_file(input_file: str) -> pd.DataFrame:
+    """reads only the columns of the input file, which are used by the scraper. Besides the excel
+    sheet, the much faster parquet and csv formats are supported
+
+    Args:
+        input_file: File name of the input file including the areas which should be scraped
+
+    Returns:
+        input_df: Dataframe with one area per row
+    """
+    extension = os.path.splitext(input_file)[1].lower()
+    if extension == ".parquet":
+        input_df = pd.read_parquet(input_file, columns=INPUT_COLUMNS)
+        # like the csv and excel values, all parquet values are read as strings (e.g. postcodes as
+        # area_block), while missing values stay missing
+        input_df = input_df.astype(str).where(input_df.notna())
+    elif extension == ".csv":
+        input_df = pd.read_csv(input_file, usecols=INPUT_COLUMNS, dtype=str)
+    else:
+        input_df = pd.read_excel(input_file, engine="openpyxl", usecols=INPUT_COLUMNS, dtype=str)
+    return input_df
@@ -1,17 +1,56 @@
-from export_to_google_cloud import set_credentials
-from gmaps_scraper import GoogleMapsScraper
-from input_file_preprocessor import get_yaml_setup
+import argparse
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ScraperConfig:
+    """Settings of the setup file, which are needed to run the scraper"""
+    # dataclass(slots=True) needs Python 3.10
+    __slots__ = ("api_key", "bucket", "cred", "file_name", "proj", "search_radius")
+    api_key: str
+    bucket: str
+    cred: str
+    file_name: str
+    proj: str
+    search_radius: float
+
+    @classmethod
+    def from_settings(cls, settings: dict) -> "ScraperConfig":
+        """reads the scraper settings from the parsed setup file
+
+        Args:
+            settings: Parsed setup.yaml
+
+        Returns:
+            config: Settings of the scraper
+        """
+        google_cloud = settings["GOOGLE_CLOUD"]
+        return cls(
+            api_key=google_cloud["Maps"]["api_key"],
+            bucket=google_cloud["Storage"]["bucket_name"],
+            cred=google_cloud["credentials_file_path"],
+            file_name=settings["LOCAL"]["input_file_name"],
+            proj=google_cloud["project_id"],
+            search_radius=settings["LOCAL"]["search_radius_km"]
+        )
 
 
 if __name__ == "__main__":
-    settings = get_yaml_setup()
-    api_key = settings["GOOGLE_CLOUD"]["Maps"]["api_key"]
-    bucket = settings["GOOGLE_CLOUD"]["Storage"]["bucket_name"]
-    cred = settings["GOOGLE_CLOUD"]["credentials_file_path"]
-    file_name = settings["LOCAL"]["input_file_name"]
-    proj = settings["GOOGLE_CLOUD"]["project_id"]
-    search_radius = settings["LOCAL"]["search_radius_km"]
-
-    set_credentials(cred)
-    scraper = GoogleMapsScraper(api_key, search_radius, proj, bucket, file_name)
-    scraper.run()
+    parser = argparse.ArgumentParser(
+        description="Scrapes all places within the areas of the input file from Google Maps"
+    )
+    parser.add_argument("-y", "--yes", action="store_true",
+                        help="start scraping without confirming the estimated costs")
+    args = parser.parse_args()
+
+    # the scraper pulls in pandas, googlemaps and the Google Cloud libraries. They are only
+    # imported after the arguments are parsed, so that --help and invalid arguments return quickly
+    from export_to_google_cloud import set_credentials
+    from gmaps_scraper import GoogleMapsScraper
+    from input_file_preprocessor import get_yaml_setup
+
+    config = ScraperConfig.from_settings(get_yaml_setup())
+    set_credentials(config.cred)
+    scraper = GoogleMapsScraper(config.api_key, config.search_radius, config.proj, config.bucket,
+                                config.file_name)
+    scraper.run(confirm_costs=not args.yes)
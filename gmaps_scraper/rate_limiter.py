@@ -0,0 +1,36 @@
+"""This module throttles the requests which are sent to the Google Maps API"""
+
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket with a bucket size of one. Every request reserves the next free time
+    slot, so that concurrent threads together never exceed the allowed queries per second.
+    """
+    def __init__(self, queries_per_second: float):
+        """Inits RateLimiter with the allowed request rate
+
+        Args:
+            queries_per_second: Maximum amount of requests which can be sent per second
+        """
+        if queries_per_second <= 0:
+            raise ValueError("queries_per_second must be bigger than 0!")
+        self.interval_s = 1 / queries_per_second
+        self._next_slot = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """Blocks the calling thread until its reserved time slot is reached
+
+        Returns:
+            None
+        """
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next_slot, now)
+            self._next_slot = slot + self.interval_s
+        # sleep outside the lock, so that the other threads can reserve their slots meanwhile
+        if slot > now:
+            time.sleep(slot - now)
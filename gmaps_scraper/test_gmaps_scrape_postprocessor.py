@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from gmaps_scrape_postprocessor import SCRAPE_SCHEMA, GMapsScrapePostprocessor
+
+
+class TestGMapsScrapePostprocessor(unittest.TestCase):
+    """Unit testing relevant functions in the GMapsScrapePostprocessor"""
+    postprocessor = GMapsScrapePostprocessor
+
+    def test_union_dataframes(self):
+        """Tests whether places found by the big and the small radius are only kept once"""
+        big_radius_df = pd.DataFrame({"place_id": ["a", "b"], "radius_size_km": [1.0, 1.0]})
+        small_radius_df = pd.DataFrame({"place_id": ["b", "c"], "radius_size_km": [0.8, 0.8]})
+        result = self.postprocessor.union_dataframes(big_radius_df, small_radius_df)
+        self.assertEqual(list(result["place_id"]), ["a", "b", "c"])
+        self.assertEqual(list(result["radius_size_km"]), [1.0, 1.0, 0.8])
+        self.assertEqual(list(result.index), [0, 1, 2])
+
+    def test_union_dataframes_missing_place_id(self):
+        """Tests whether places are deduplicated by their place_id, while rows without a place_id
+        are kept"""
+        big_radius_df = pd.DataFrame({"place_id": ["a", None], "lat_long": ["1, 1", "1, 1"]})
+        small_radius_df = pd.DataFrame({"place_id": ["a", None], "lat_long": ["2, 2", "2, 2"]})
+        result = self.postprocessor.union_dataframes(big_radius_df, small_radius_df)
+        self.assertEqual(list(result["lat_long"]), ["1, 1", "1, 1", "2, 2"])
+        self.assertEqual(result["place_id"].isna().sum(), 2)
+        self.assertEqual(list(result.index), [0, 1, 2])
+
+    def test_save_parquet(self):
+        """Tests whether existing scrapes are kept and the next free version suffix is used"""
+        scrape_df = pd.DataFrame({"name": ["REWE"]})
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            sub_folder = os.path.join(tmp_dir, "scrapes")
+            file_names = [self.postprocessor.save_parquet(scrape_df, "area.parquet", sub_folder)
+                          for _ in range(3)]
+            self.assertEqual(file_names, ["area.parquet", "area_1.parquet", "area_2.parquet"])
+
+            os.remove(os.path.join(sub_folder, "area_1.parquet"))
+            file_name = self.postprocessor.save_parquet(scrape_df, "area.parquet", sub_folder)
+            self.assertEqual(file_name, "area_3.parquet")
+            self.assertEqual(len(os.listdir(sub_folder)), 3)
+
+    def test_save_parquet_schema(self):
+        """Tests whether the scrape is saved with the fixed schema and nested values as JSON"""
+        scrape_df = pd.DataFrame({
+            "index": [0, 1],
+            "name": ["REWE", "ALDI"],
+            "types": [["supermarket", "store"], float("nan")],
+            "user_ratings_total": [1176.0, float("nan")],
+        })
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_name = self.postprocessor.save_parquet(scrape_df, "area.parquet", tmp_dir)
+            result = pd.read_parquet(os.path.join(tmp_dir, file_name))
+        self.assertEqual(list(result.columns), SCRAPE_SCHEMA.names)
+        self.assertEqual(result.loc[0, "types"], '["supermarket", "store"]')
+        self.assertTrue(pd.isna(result.loc[1, "types"]))
+        self.assertEqual(result.loc[0, "user_ratings_total"], 1176)
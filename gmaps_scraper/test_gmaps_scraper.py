@@ -1,50 +1,109 @@
+import json
 import unittest
+from unittest import mock
 
-from gmaps_scraper import AreaScraper
+import googlemaps
+import numpy as np
+
+from gmaps_scraper import AreaScraper, _RateLimitedAdapter, _is_successful_api_response
 
 
 class TestAreaScraper(unittest.TestCase):
     """Unit testing relevant functions in the AreaScraper"""
     scraper = AreaScraper
 
+    # start nodes and added distances in km of the great circle tests
+    nodes = [((0, 0), 1), ((52.5, 13.4), 1), ((-33.9, 151.2), 10)]
+
     def test_new_longitude(self):
         """Tests whether the addition of a great circle distance is calculated right on the
         longitude"""
-        result = self.scraper.add_km_to_longitude(previous_node=(0, 0), added_distance_km=1)
-        self.assertAlmostEqual(result, 0.008983152841195215)
+        result = [self.scraper.add_km_to_longitude(previous_node=node, added_distance_km=distance)
+                  for node, distance in self.nodes]
+        expected = [0.00899320363724538, 13.414772952232626, 151.30835020714593]
+        np.testing.assert_allclose(result, expected, rtol=0, atol=1e-12)
 
     def test_new_latitude(self):
         """Tests whether the addition of a great circle distance is calculated right on the
         latitude"""
-        result = self.scraper.add_km_to_latitude(previous_node=(0, 0), added_distance_km=1)
-        self.assertAlmostEqual(result, -0.009043694769749644)
-
-    def test_get_longitude_in_iteration(self):
-        """Tests whether the iteration adds a distance on the start longitude and the following
-        one"""
-        longitude = self.scraper.get_longitude_in_iteration(start_longitude=1,
-                                                            node=(1, 1),
-                                                            diameter_km=1,
-                                                            column_number=0)
-        self.assertEqual(longitude, 1)
-
-        longitude = self.scraper.get_longitude_in_iteration(start_longitude=1,
-                                                            node=(1, 1),
-                                                            diameter_km=1,
-                                                            column_number=1)
-        self.assertAlmostEqual(longitude, 1.0089845120674696)
-
-    def test_get_latitude_in_iteration(self):
-        """Tests whether the iteration adds a distance on the start latitude and the following
-        one"""
-        latitude = self.scraper.get_latitude_in_iteration(start_latitude=1,
-                                                          node=(1, 1),
-                                                          diameter_km=1,
-                                                          row_number=0)
-        self.assertEqual(latitude, 1)
-
-        latitude = self.scraper.get_latitude_in_iteration(start_latitude=1,
-                                                          node=(1, 1),
-                                                          diameter_km=1,
-                                                          row_number=1)
-        self.assertAlmostEqual(latitude, 0.9909563326404907)
+        result = [self.scraper.add_km_to_latitude(previous_node=node, added_distance_km=distance)
+                  for node, distance in self.nodes]
+        expected = [-0.00899320363724538, 52.49100679636276, -33.98993203637245]
+        np.testing.assert_allclose(result, expected, rtol=0, atol=1e-12)
+
+    def test_build_node_grid(self):
+        """Tests whether the rows of the node grid are one step to the south and the columns one
+        step to the east of each other"""
+        latitudes, longitudes = self.scraper._build_node_grid(start_latitude=0,
+                                                              start_longitude=0,
+                                                              step_km=1,
+                                                              n_rows=2,
+                                                              n_cols=3)
+        self.assertEqual(latitudes.shape, (2,))
+        self.assertEqual(longitudes.shape, (2, 3))
+        step = 0.00899320363724538
+        np.testing.assert_allclose(latitudes, [0, -step], rtol=0, atol=1e-12)
+        np.testing.assert_allclose(longitudes[0], [0, step, 2 * step], rtol=0, atol=1e-12)
+        self.assertLess(longitudes[0, 1], longitudes[1, 1])
+        # every node is one step to the east of its predecessor on the row's parallel
+        expected_longitudes = [
+            self.scraper.add_km_to_longitude(previous_node=(latitudes[1], longitude),
+                                             added_distance_km=1)
+            for longitude in longitudes[1, :-1]
+        ]
+        np.testing.assert_allclose(longitudes[1, 1:], expected_longitudes, rtol=0, atol=1e-12)
+
+    def test_build_node_grids(self):
+        """Tests whether several grids built at once equal the grids built one by one"""
+        start_latitudes = [52.5, 52.49]
+        start_longitudes = [13.3, 13.31]
+        latitudes, longitudes = self.scraper._build_node_grid(start_latitude=start_latitudes,
+                                                              start_longitude=start_longitudes,
+                                                              step_km=2,
+                                                              n_rows=4,
+                                                              n_cols=5)
+        self.assertEqual(latitudes.shape, (2, 4))
+        self.assertEqual(longitudes.shape, (2, 4, 5))
+        for grid_number in range(2):
+            grid_latitudes, grid_longitudes = self.scraper._build_node_grid(
+                start_latitudes[grid_number], start_longitudes[grid_number], 2, 4, 5
+            )
+            np.testing.assert_array_equal(latitudes[grid_number], grid_latitudes)
+            np.testing.assert_array_equal(longitudes[grid_number], grid_longitudes)
+
+    def test_invalid_next_page_token(self):
+        """Tests whether the pages of a node are kept if the next page token stays invalid"""
+        scraper = self.scraper.__new__(self.scraper)
+        scraper.gmaps = mock.Mock()
+        scraper.gmaps.places_nearby.side_effect = [
+            {"results": [{"place_id": "a"}], "next_page_token": "token"}
+        ] + [googlemaps.exceptions.ApiError("INVALID_REQUEST")] * len(scraper.PAGE_TOKEN_DELAYS_S)
+        with mock.patch("gmaps_scraper.time.sleep"):
+            page_dfs = scraper._get_data_from_location_node((52.5, 13.4), "cafe", 1)
+        self.assertEqual(len(page_dfs), 1)
+        self.assertEqual(list(page_dfs[0]["place_id"]), ["a"])
+        self.assertEqual(scraper.gmaps.places_nearby.call_count,
+                         1 + len(scraper.PAGE_TOKEN_DELAYS_S))
+
+    def test_is_successful_api_response(self):
+        """Tests whether only successful responses without a next page token are cached"""
+        bodies = {
+            '{"status": "OK", "results": []}': True,
+            '{"status": "ZERO_RESULTS", "results": []}': True,
+            '{"status": "OK", "results": [], "next_page_token": "token"}': False,
+            '{"status": "INVALID_REQUEST", "results": []}': False,
+            'not json': False
+        }
+        for body, is_cached in bodies.items():
+            response = mock.Mock(status_code=200)
+            response.json.side_effect = lambda body=body: json.loads(body)
+            self.assertEqual(_is_successful_api_response(response), is_cached)
+
+    def test_rate_limited_adapter(self):
+        """Tests whether every request sent through the adapter waits for the rate limiter"""
+        rate_limiter = mock.Mock()
+        adapter = _RateLimitedAdapter(rate_limiter)
+        with mock.patch("gmaps_scraper.HTTPAdapter.send", return_value="response") as send:
+            self.assertEqual(adapter.send("request"), "response")
+        rate_limiter.wait.assert_called_once_with()
+        send.assert_called_once_with("request")
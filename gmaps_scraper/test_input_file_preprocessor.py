@@ -1,17 +1,28 @@
+import json
+import os
+import shutil
+import tempfile
 import unittest
+from math import pi
 
 from input_file_preprocessor import *
+from input_file_preprocessor import _YAML_SETUP_CACHE
 
 
 class TestInputFilePreprocessor(unittest.TestCase):
     """Unit testing relevant functions in the InputFilePreprocessor"""
-    preprocessor = InputFilePreprocessor(1)
+    @classmethod
+    def setUpClass(cls):
+        """Parses a copy of the setup file and creates the preprocessor once for all tests. The
+        copy keeps the JSON sidecar of the setup file out of the repository"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            yaml_path = shutil.copy("../setup.yaml", tmp_dir)
+            cls.yaml_config = get_yaml_setup(yaml_path)
+        cls.preprocessor = InputFilePreprocessor(1)
 
     def test_calculate_small_radius(self):
         """Tests whether the small radius is calculated right"""
-        big_radius = 1
-        preprocessor = InputFilePreprocessor(big_radius)
-        result = preprocessor.calculate_small_radius()
+        result = self.preprocessor.calculate_small_radius()
         self.assertAlmostEqual(result, 0.8284271)
 
         error_radii = [0, -1]
@@ -22,7 +33,7 @@ class TestInputFilePreprocessor(unittest.TestCase):
 
     def test_get_yaml_setup(self):
         """Tests the input within the setup.yaml"""
-        yaml = get_yaml_setup()
+        yaml = self.yaml_config
         input_file_name = yaml['LOCAL']['input_file_name']
         self.assertIsInstance(input_file_name, str)
         search_radius = yaml['LOCAL']['search_radius_km']
@@ -39,35 +50,99 @@ class TestInputFilePreprocessor(unittest.TestCase):
         maps_api_key = yaml['GOOGLE_CLOUD']['Maps']['api_key']
         self.assertIsInstance(maps_api_key, str)
 
+    def test_get_yaml_setup_cache(self):
+        """Tests whether the cached setup is only returned as long as the file is unchanged"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "setup.yaml")
+            with open(file_path, "w") as file:
+                file.write("LOCAL:\n  search_radius_km: 1\n")
+            setup = get_yaml_setup(file_path)
+            setup["LOCAL"]["search_radius_km"] = 5
+            self.assertEqual(get_yaml_setup(file_path)["LOCAL"]["search_radius_km"], 1)
+
+            with open(file_path, "w") as file:
+                file.write("LOCAL:\n  search_radius_km: 2.5\n")
+            self.assertEqual(get_yaml_setup(file_path)["LOCAL"]["search_radius_km"], 2.5)
+
+    def test_get_yaml_setup_json_sidecar(self):
+        """Tests whether the parsed setup is stored in a JSON sidecar file, which is only used as
+        long as the yaml file keeps the same modification time and size"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "setup.yaml")
+            with open(file_path, "w") as file:
+                file.write("LOCAL:\n  input_file_name: setup_area.xlsx\n")
+            setup = get_yaml_setup(file_path)
+            with open(file_path + ".json", "r") as file:
+                sidecar = json.load(file)
+            self.assertEqual(sidecar["setup"], setup)
+
+            sidecar["setup"] = {"LOCAL": {"input_file_name": "from_sidecar.csv"}}
+            with open(file_path + ".json", "w") as file:
+                json.dump(sidecar, file)
+            _YAML_SETUP_CACHE.clear()
+            setup = get_yaml_setup(file_path)
+            self.assertEqual(setup["LOCAL"]["input_file_name"], "from_sidecar.csv")
+
+            # a changed yaml file with its old modification time must not return the sidecar
+            file_stat = os.stat(file_path)
+            with open(file_path, "w") as file:
+                file.write("LOCAL:\n  input_file_name: restored.xlsx\n")
+            os.utime(file_path, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns))
+            _YAML_SETUP_CACHE.clear()
+            setup = get_yaml_setup(file_path)
+            self.assertEqual(setup["LOCAL"]["input_file_name"], "restored.xlsx")
+
     def test_search_terms_to_list(self):
         """Tests whether the search terms are restructured from string to a list"""
         search_terms = "abc, def,,   ,ghi,123"
         result = self.preprocessor.search_terms_to_list(search_terms)
         self.assertEqual(result, ["abc", "def", "ghi", "123"])
 
+    def test_coords_to_tuple(self):
+        """Tests whether coordinates are converted from a string to a tuple of floats"""
+        for coords in ["52.52, 13.38", "(52.52, 13.38)", " 52.52,13.38 "]:
+            self.assertEqual(self.preprocessor.coords_to_tuple(coords), (52.52, 13.38))
+
+        error_coords = ["52.52 13.38", "52.52, 13.38, 1", "52.52, abc", "__import__('os'), 1"]
+        for coords in error_coords:
+            with self.assertRaises(Exception):
+                self.preprocessor.coords_to_tuple(coords)
+
     def test_calculate_amount_of_requests(self):
         """Tests whether the amount of requests per horizontal and vertical line within the node-
         loop is calculated right"""
-        radius = 1
-        preprocessor = InputFilePreprocessor(radius)
         upper_left_coord = (52.68910140425828, 13.060384819899381)
         lower_right_coord = (52.41019183750047, 13.775869390116974)
         upper_right_coord = (upper_left_coord[0], lower_right_coord[1])
-        req_per_row, req_per_col = preprocessor.calculate_amount_of_requests(
+        req_per_row, req_per_col = self.preprocessor.calculate_amount_of_requests(
             upper_left_coord,
             lower_right_coord,
             upper_right_coord
         )
         self.assertEqual((req_per_row, req_per_col), (24, 15))
 
+    def test_great_circle_distance_km(self):
+        """Tests whether the distance in between two coordinates is calculated right"""
+        self.assertAlmostEqual(great_circle_distance_km((0, 0), (0, 1)), 111.1950802335329)
+        self.assertAlmostEqual(great_circle_distance_km((0, 0), (0, 180)), 20015.114442035923)
+        self.assertEqual(great_circle_distance_km((52.5, 13.4), (52.5, 13.4)), 0)
+
+    def test_great_circle_distance_km_antipodal(self):
+        """Tests whether the distance in between antipodal points is half the earth's
+        circumference"""
+        # rounding errors push the haversine term above 1 for some of these points
+        for first_coords in [(0, 0), (-50.06, -96.73), (-1.83, -173.71), (80.87, -20.18)]:
+            second_coords = (-first_coords[0], first_coords[1] + 180)
+            self.assertAlmostEqual(great_circle_distance_km(first_coords, second_coords),
+                                   pi * EARTH_RADIUS_KM)
+
     def test_validate_amount_of_requests(self):
         """Test whether an error is raised if 4 big radii don't fit in the to be scraped area"""
         radius = 1.5
-        preprocessor = InputFilePreprocessor(radius)
         geodesic_distance = 4
         diameter = radius * 2
         with self.assertRaises(ValueError):
-            preprocessor.validate_amount_of_requests(geodesic_distance, diameter)
+            self.preprocessor.validate_amount_of_requests(geodesic_distance, diameter)
 
     def test_validate_coordinates_values(self):
         """Tests whether latitudes [longitudes] are within -90 and 90 [-180 and 180]"""
@@ -79,3 +154,30 @@ class TestInputFilePreprocessor(unittest.TestCase):
 
         good_coords = (0, 0)
         self.assertIsNone(self.preprocessor.validate_coordinates_values(good_coords))
+
+    def test_validate_coordinates_batch(self):
+        """Tests whether a single invalid coordinate pair fails the validation of all pairs"""
+        good_coords = [(52.52, 13.38), (-89.9, 179.9), (0, 0)]
+        self.assertIsNone(self.preprocessor.validate_coordinates_batch(good_coords))
+
+        for error_coords in [(90, 0), (0, -180), (float("nan"), 0)]:
+            with self.assertRaises(ValueError):
+                self.preprocessor.validate_coordinates_batch(good_coords + [error_coords])
+
+    def test_read_input_file(self):
+        """Tests whether only the used columns are read from a csv or parquet input file and all
+        values are read as strings"""
+        input_df = pd.DataFrame({column: ["1, 2", None] for column in INPUT_COLUMNS + ["comment"]})
+        input_df["area_block"] = [10115, 10117]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for file_name in ["setup_area.csv", "setup_area.parquet"]:
+                input_file = os.path.join(tmp_dir, file_name)
+                if file_name.endswith(".csv"):
+                    input_df.to_csv(input_file, index=False)
+                else:
+                    input_df.to_parquet(input_file, index=False)
+                result = read_input_file(input_file)
+                self.assertEqual(sorted(result.columns), sorted(INPUT_COLUMNS))
+                self.assertEqual(result.loc[0, "upper_left_coordinates"], "1, 2")
+                self.assertTrue(pd.isna(result.loc[1, "upper_left_coordinates"]))
+                self.assertEqual(result["area_block"].tolist(), ["10115", "10117"])
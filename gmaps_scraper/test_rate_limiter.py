@@ -0,0 +1,40 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from rate_limiter import RateLimiter
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Unit testing the request throttling of the RateLimiter"""
+
+    def test_wait_spaces_out_requests(self):
+        """Tests whether concurrent requests are spread over the allowed time slots"""
+        with mock.patch("rate_limiter.time.monotonic", return_value=100.0), \
+                mock.patch("rate_limiter.time.sleep") as sleep:
+            rate_limiter = RateLimiter(queries_per_second=20)
+            with ThreadPoolExecutor(max_workers=5) as executor:
+                for _ in range(5):
+                    executor.submit(rate_limiter.wait)
+        # the first request is sent at once and every further one waits for its own slot
+        sleeps_s = sorted(sleep_call.args[0] for sleep_call in sleep.call_args_list)
+        self.assertEqual(len(sleeps_s), 4)
+        for slot_number, sleep_s in enumerate(sleeps_s, start=1):
+            self.assertAlmostEqual(sleep_s, slot_number * rate_limiter.interval_s)
+        self.assertAlmostEqual(rate_limiter._next_slot, 100.0 + 5 * rate_limiter.interval_s)
+
+    def test_wait_after_idle_time(self):
+        """Tests whether a request after a pause is sent without waiting"""
+        with mock.patch("rate_limiter.time.monotonic", side_effect=[100.0, 100.0, 101.0]), \
+                mock.patch("rate_limiter.time.sleep") as sleep:
+            rate_limiter = RateLimiter(queries_per_second=20)
+            rate_limiter.wait()
+            rate_limiter.wait()
+        sleep.assert_not_called()
+        self.assertAlmostEqual(rate_limiter._next_slot, 101.0 + rate_limiter.interval_s)
+
+    def test_invalid_queries_per_second(self):
+        """Tests whether an error is raised if the request rate is not positive"""
+        for queries_per_second in [0, -1]:
+            with self.assertRaises(ValueError):
+                RateLimiter(queries_per_second)